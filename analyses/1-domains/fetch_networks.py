@@ -28,7 +28,6 @@ Details information including citation data can be found of pages
 corresponding to individual datasets
 (for instance `https://networks.skewed.de/net/karate`).
 """
-import graph_tool.all as gt
 from src import DATA
 from src._ns import Netzschleuder
 from src._argparse import get_parser
@@ -37,8 +36,9 @@ from src._argparse import get_parser
 def get_component(idx: int, *, directed: bool = False):
     """Component extraction function factory."""
     def component_getter(graph):
-        comp = gt.label_components(graph, directed=directed)[0].get_array()
-        return gt.GraphView(graph, vfilt=comp == idx).copy()
+        mode = "strong" if directed else "weak"
+        components = graph.components(mode=mode)
+        return graph.induced_subgraph(components[idx])
     return component_getter
 
 
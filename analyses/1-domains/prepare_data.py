@@ -39,16 +39,21 @@ def make_data(
         df = PathCensus(graph, **kwds).coefs("nodes")
         return df
 
-    # Extract graph metadata
-    def insert_metadata(df, graph):
-        df.insert(0, "density", graph.density())
-        df.insert(0, "n_nodes", graph.vcount())
-        df.insert(0, "desc", graph["desc"])
-        df.insert(0, "relation", graph["relation"])
-        df.insert(0, "domain", graph["domain"])
-        df.insert(0, "label", graph["label"])
-        df.insert(0, "name", graph["name"])
-        return df
+    # Extract graph metadata once; attaching it is then a single
+    # assign + column reindex per frame instead of seven
+    # block-manager reshuffling inserts
+    meta = {
+        "name":     graph["name"],
+        "label":    graph["label"],
+        "domain":   graph["domain"],
+        "relation": graph["relation"],
+        "desc":     graph["desc"],
+        "n_nodes":  graph.vcount(),
+        "density":  graph.density()
+    }
+
+    def insert_metadata(df):
+        return df.assign(**meta).reindex(columns=[*meta, *df.columns])
 
     model = UBCM(graph)
     model.fit()
@@ -59,25 +64,24 @@ def make_data(
     data, null = infer.init_comparison(n, sample_index=True, null_kws=null_kws)
     levels     = infer.get_levels(data)
 
-    # Calibrated node-wise coefficients
-    def subsample(df, max_n=1000):
-        n = max_n if (nrow := len(df)) > max_n else nrow
-        return df.sample(n, replace=False)
-
-    cnull = null.groupby(level=levels.stats) \
-        .apply(subsample) \
-        .reset_index(level=0, drop=True)
+    # Calibrated node-wise coefficients;
+    # subsample at most 1000 rows per group of sufficient statistics
+    # with a single shuffle + head() instead of a Python callback
+    # (and a data frame allocation) per group
+    cnull = null.sample(frac=1.0, random_state=303) \
+        .groupby(level=levels.stats, sort=False, group_keys=False) \
+        .head(1000)
     cdata = np.log(data / cnull) \
         .replace([np.inf, -np.inf], np.nan) \
         .mean() \
         .to_frame().T \
-        .pipe(insert_metadata, graph=graph)
+        .pipe(insert_metadata)
 
     # Coverage report for sufficient statistics
-    report = null.groupby(level=levels.stats).size()
+    report = null.groupby(level=levels.stats, sort=False).size()
 
     # Estimate fractions of nodes with significantly high values
-    P     = PathCensus(graph)
+    P     = PathCensus(graph, **kwds)
     alpha = 0.01
     pvals = infer.estimate_pvalues(data, null, adjust=True, alpha=alpha)
     sig   = (pvals <= alpha).mean() \
@@ -86,26 +90,49 @@ def make_data(
 
     sig.insert(0, "comp", P.complementarity("global"))
     sig.insert(0, "sim", P.similarity("global"))
-    sig.insert(0, "density", graph.density())
-    sig.insert(0, "n_nodes", graph.vcount())
-    insert_metadata(sig, graph)
+    # `n_nodes` and `density` come with the rest of the metadata
+    sig = insert_metadata(sig)
 
     # Prepare data for degree correlations
     null = null.reset_index(["di", "_sample"]).reset_index(drop=True)
     data = data.reset_index("di").reset_index(drop=True)
     data.insert(1, "_sample", -1)
 
-    data = data[data["di"] > 0]
-    null = null[null["di"] > 0]
-
+    # Degrees are non-negative integers, so after a stable sort on
+    # `di` the zero-degree rows form a prefix which is sliced off
+    # with searchsorted() instead of allocating a boolean mask and
+    # copying; the groupby below re-buckets the rows anyway, so the
+    # ordering change is immaterial
+    data = data.sort_values("di", kind="stable")
+    data = data.iloc[np.searchsorted(data["di"].to_numpy(), 1):]
+    null = null.sort_values("di", kind="stable")
+    null = null.iloc[np.searchsorted(null["di"].to_numpy(), 1):]
+
+    frames = []
     for df, which in [(data, "observed"), (null, "randomized")]:
-        df.insert(1, "dbin", 2**np.log2(df["di"]).astype(int))
-        insert_metadata(df, graph)
+        # Largest power of two not greater than the degree;
+        # frexp() yields the exact binary exponent, so the bin is
+        # computed with a bit shift instead of a float log/pow
+        # round-trip
+        dexp = np.frexp(df["di"].to_numpy(np.float64))[1]
+        df.insert(1, "dbin", np.left_shift(1, dexp - 1))
+        df = insert_metadata(df)
         df.insert(1, "which", which)
+        frames.append(df)
+    data, null = frames
 
     keys = data.loc[:, "name":"desc"].columns.tolist()
+    # Group keys are short strings repeated across all rows;
+    # as categoricals the groupby hashes small integer codes
+    # instead of Python objects, and observed=True already skips
+    # the empty key combinations
+    for df in (data, null):
+        df[keys] = df[keys].astype("category")
     data = pd.concat([data, null], axis=0) \
-        .groupby([*keys, "dbin", "_sample"], dropna=False) \
+        .groupby(
+            [*keys, "dbin", "_sample"],
+            dropna=False, observed=True, sort=False
+        ) \
         .mean() \
         .reset_index() \
         .drop(columns="_sample")
@@ -121,21 +148,28 @@ DATA.mkdir(parents=True, exist_ok=True)
 dataset = "domains"
 names   = list_graphs(dataset)
 
-NETWORKS = {
-    name: load_graph(dataset, name, preprocess=True)
-    for name in names
-}
+def iter_networks():
+    """Iterate over preprocessed graphs lazily.
+
+    Graphs are loaded one at a time so only the currently processed
+    network is held in memory; the preprocessed form is cached on
+    disk so subsequent runs skip parsing and preprocessing.
+    """
+    for name in names:
+        yield name, load_graph(dataset, name, preprocess=True, cache=True)
 
 # Set seeds of random number generators
 set_seed(303)
 
 N    = 100
 data = {}
-pbar = tqdm(NETWORKS.items())
+pbar = tqdm(iter_networks(), total=len(names))
 
 for name, graph in pbar:
     pbar.set_description(f"{name}")
     n = N if graph.vcount() > 1000 else N*2
-    data[name] = make_data(graph, n=n)
+    # Networks are processed sequentially here, so let the
+    # numba-compiled path census kernels use all cores
+    data[name] = make_data(graph, n=n, parallel=True)
 
-joblib.dump(data, filename=DATA/"domains.pkl.gz", compress=True)
+joblib.dump(data, filename=DATA/"domains.pkl.gz", compress=("lz4", 3))
@@ -1,5 +1,6 @@
 """Script for generating data for the analysis."""
-from typing import Dict
+from typing import Dict, Tuple
+import zlib
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -10,26 +11,59 @@ from pathcensus import PathCensus
 from pathcensus.nullmodels import UBCM
 from pathcensus.inference import Inference
 from pathcensus.utils import set_seed
-from src.utils import list_graphs, load_graph, preprocess_graph
+from src.utils import add_index_level, calibrate, list_graphs, load_graph, \
+    preprocess_graph
 
 
 # Graph statistics function ---------------------------------------------------
 
 def statistics(graph: ig.Graph) -> pd.DataFrame:
-    """Function for calculating graph statistics."""
+    """Function for calculating graph statistics.
+
+    The path census is computed once and the coefficients at all
+    three aggregation levels are derived from it with a single
+    ``coefs()`` pass per level instead of separate similarity
+    and complementarity aggregations over the edge census.
+    """
     paths = PathCensus(graph)
     coefs = paths.coefs("nodes")
+    edges = paths.coefs("edges")
+    glob  = paths.coefs("global")
     df = pd.DataFrame({
-        "sim_g":   paths.similarity("global"),
+        "sim_g":   glob["sim_g"],
         "sim":     coefs["sim"].mean(),
-        "sim_e":   paths.similarity("edges").mean(),
-        "comp_g":  paths.complementarity("global"),
+        "sim_e":   edges["sim"].mean(),
+        "comp_g":  glob["comp_g"],
         "comp":    coefs["comp"].mean(),
-        "comp_e":  paths.complementarity("edges").mean(),
+        "comp_e":  edges["comp"].mean(),
         "coefs":   [coefs]
     }, index=[0])
     return df
 
+def init_comparison(
+    graph: ig.Graph,
+    model: UBCM,
+    n: int,
+    base_seed: int
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Observed and null model statistics with parallel sampling.
+
+    Replacement for :py:meth:`Inference.init_comparison` which draws
+    the ``n`` null model samples in parallel with :py:mod:`joblib`
+    instead of sequentially. Each sample is drawn under its own seed
+    derived from ``base_seed`` so the null distribution does not
+    depend on worker scheduling.
+    """
+    def sample(seed: int) -> pd.DataFrame:
+        set_seed(seed)
+        return statistics(model.sample_one())
+
+    data = statistics(graph)
+    null = pd.concat(joblib.Parallel(n_jobs=-1, backend="loky")(
+        joblib.delayed(sample)(base_seed + i) for i in range(n)
+    ))
+    return data, null
+
 def get_metadata(graph: ig.Graph) -> Dict:
     """Get graph metadata dictionary."""
     name = graph["name"]
@@ -53,9 +87,10 @@ DATA.mkdir(parents=True, exist_ok=True)
 # Number of null model samples
 N_SAMPLES = 200
 
-# Seed for the random number generator
-# used for sampling from the null model
-set_seed(1019)
+# Base seed for the random number generator
+# used for sampling from the null model;
+# each network gets its own seed derived from it
+SEED = 1019
 
 rawdata = []
 
@@ -67,22 +102,25 @@ for network in tqdm(list_graphs("social")):
     degseq  = np.array(graph.degree())
     name    = graph["name"]
 
-    net = pd.DataFrame({
+    net = {
         **get_metadata(graph),
-        "graph":      [graph],
+        "graph":      graph,
         "n_nodes":    n_giant,
         "frac_total": n_giant / n_total,
         "density":    graph.density(),
         "dbar":       degseq.mean(),
         "dcv":        degseq.std() / degseq.mean(),
         "dmax":       degseq.max()
-    }, index=[0])
+    }
     # Structural coefficients and null distributions
     model = UBCM(graph)
     model.fit()
     model.validate()
     infer = Inference(graph, model, statistics)
-    data, null = infer.init_comparison(n=N_SAMPLES)
+    data, null = init_comparison(
+        graph, model, n=N_SAMPLES,
+        base_seed=SEED + zlib.crc32(network.encode())
+    )
 
     # Estimate fractions of significant nodes
     odf = pd.concat(data.pop("coefs").tolist())
@@ -91,8 +129,8 @@ for network in tqdm(list_graphs("social")):
     infer.add_stats_index(odf)
     infer.add_stats_index(ndf)
 
-    odf = pd.concat([odf], keys=[0], names=["_"])
-    ndf = pd.concat([ndf], keys=[0], names=["_"])
+    add_index_level(odf)
+    add_index_level(ndf)
 
     alpha = 0.01
     pvals = infer.estimate_pvalues(odf, ndf, alpha=alpha, adjust=True)
@@ -102,23 +140,21 @@ for network in tqdm(list_graphs("social")):
     sig = sig.mean().to_frame().T
 
     # Compute calibrated coefficients
-    cdata = np.log(data / null).reset_index(drop=True) \
-        .replace([np.inf, -np.inf], np.nan) \
-        .dropna() \
-        .mean() \
-        .to_frame().T
+    cdata = calibrate(data, null)
 
-    net["rawdata"]     = [data]
-    net["calibrated"]  = [cdata]
-    net["significant"] = [sig]
+    net["rawdata"]     = data
+    net["calibrated"]  = cdata
+    net["significant"] = sig
 
     rawdata.append(net)
 
 
 # Prepare data frames ---------------------------------------------------------
 
-villages = pd.concat(rawdata, axis=0, ignore_index=True)
+# One data frame built from plain records instead of concatenating
+# per-network 1-row frames
+villages = pd.DataFrame(rawdata)
 
 # Save data -------------------------------------------------------------------
 
-joblib.dump(villages, DATA/"social.pkl.gz", compress=True)
+joblib.dump(villages, DATA/"social.pkl.gz", compress=("lz4", 3))
@@ -1,6 +1,7 @@
 """Script for generating data for the analysis."""
-from typing import Dict
+from typing import Dict, Tuple
 import ast
+import zlib
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -11,25 +12,62 @@ from pathcensus import PathCensus
 from pathcensus.nullmodels import UBCM
 from pathcensus.inference import Inference
 from pathcensus.utils import set_seed
-from src.utils import list_graphs, load_graph
+from src.utils import add_index_level, calibrate, list_graphs, load_graph
 
 
 # Graph statistics function ---------------------------------------------------
 
 def statistics(graph: ig.Graph) -> pd.DataFrame:
-    """Function for calculating graph statistics."""
+    """Function for calculating graph statistics.
+
+    The path census is computed once and the coefficients at all
+    three aggregation levels are derived from it with a single
+    ``coefs()`` pass per level instead of separate similarity
+    and complementarity aggregations over the edge census.
+    """
     paths = PathCensus(graph)
     coefs = paths.coefs("nodes")
+    edges = paths.coefs("edges")
+    glob  = paths.coefs("global")
     return pd.DataFrame({
-        "sim_g":   paths.similarity("global"),
+        "sim_g":   glob["sim_g"],
         "sim":     coefs["sim"].mean(),
-        "sim_e":   paths.similarity("edges").mean(),
-        "comp_g":  paths.complementarity("global"),
+        "sim_e":   edges["sim"].mean(),
+        "comp_g":  glob["comp_g"],
         "comp":    coefs["comp"].mean(),
-        "comp_e":  paths.complementarity("edges").mean(),
+        "comp_e":  edges["comp"].mean(),
         "coefs":   [coefs]
     }, index=[0])
 
+def init_comparison(
+    graph: ig.Graph,
+    model: UBCM,
+    n: int,
+    base_seed: int
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Observed and null model statistics with parallel sampling.
+
+    Replacement for :py:meth:`Inference.init_comparison` which draws
+    the ``n`` null model samples in parallel with :py:mod:`joblib`
+    instead of sequentially. Each sample is drawn under its own seed
+    derived from ``base_seed`` so the null distribution does not
+    depend on worker scheduling.
+
+    When invoked from within a worker of the outer per-network loop
+    :py:mod:`joblib` runs the inner loop sequentially, so there is no
+    oversubscription; the parallelism kicks in when networks are
+    processed with fewer outer jobs.
+    """
+    def sample(seed: int) -> pd.DataFrame:
+        set_seed(seed)
+        return statistics(model.sample_one())
+
+    data = statistics(graph)
+    null = pd.concat(joblib.Parallel(n_jobs=-1, backend="loky")(
+        joblib.delayed(sample)(base_seed + i) for i in range(n)
+    ))
+    return data, null
+
 def get_metadata(graph: ig.Graph) -> Dict:
     """Get graph metadata dictionary."""
     degseq   = np.array(graph.degree())
@@ -68,30 +106,30 @@ def get_metadata(graph: ig.Graph) -> Dict:
         "dmax":        degseq.max()
     }
 
-# Prepare data ----------------------------------------------------------------
+def add_metadata(df: pd.DataFrame, meta: Dict) -> pd.DataFrame:
+    """Prepend metadata columns to a data frame.
 
-HERE = Path(__file__).parent
-DATA = HERE/"data"
-DATA.mkdir(parents=True, exist_ok=True)
+    Uses a single ``assign`` + column reindex instead of one
+    block-manager reshuffle per inserted column.
+    """
+    return df.assign(**meta).reindex(columns=[*meta, *df.columns])
 
-# Number of null model samples
-N_SAMPLES = 100
+# Network processing function -------------------------------------------------
 
-# Seed for the random number generator
-# used for sampling from the null model
-set_seed(44)
+def process_network(network: str) -> Tuple[pd.DataFrame, ...]:
+    """Process a single network.
 
-rawdata    = []
-nulltrend  = []
-calibrated = []
-signif_01  = []
-signif_05  = []
-signif_10  = []
+    Returns a tuple of data frames with raw statistics,
+    null model averages, calibrated coefficients and fractions
+    of significant nodes at the three significance levels.
 
-pbar = tqdm(list_graphs("proteins"))
+    Networks are independent of each other so this function may be
+    mapped over them in parallel. The seed of the random number
+    generator is derived from the network name so results do not
+    depend on the order of execution.
+    """
+    base_seed = SEED + zlib.crc32(network.encode())
 
-for network in pbar:
-    pbar.set_description(network.split("__")[-1])
     graph = load_graph("proteins", network, preprocess=True)
     meta  = get_metadata(graph)
 
@@ -100,7 +138,7 @@ for network in pbar:
     model.validate()
 
     infer      = Inference(graph, model, statistics)
-    data, null = infer.init_comparison(N_SAMPLES, null_kws=dict(progress=True))
+    data, null = init_comparison(graph, model, N_SAMPLES, base_seed)
 
     # Estimate fractions of significant nodes
     odf = pd.concat(data.pop("coefs").tolist())
@@ -109,8 +147,8 @@ for network in pbar:
     infer.add_stats_index(odf)
     infer.add_stats_index(ndf)
 
-    odf = pd.concat([odf], keys=[0], names=["_"])
-    ndf = pd.concat([ndf], keys=[0], names=["_"])
+    add_index_level(odf)
+    add_index_level(ndf)
 
     pvals = infer.estimate_pvalues(odf, ndf, adjust=False)
     sigs  = []
@@ -125,10 +163,7 @@ for network in pbar:
         sig["neither"] = 1 - sig[["sim", "comp", "both"]].sum(axis=1)
         sig = sig.mean().to_frame().T
         # Add graph metadata
-        for k, v in reversed(meta.items()):
-            sig.insert(0, k, v)
-        # Append to data list
-        sigs.append(sig)
+        sigs.append(add_metadata(sig, meta))
 
     # Unpack significance data
     sig01, sig05, sig10 = sigs
@@ -137,17 +172,47 @@ for network in pbar:
     null_avg = null.mean().to_frame().T
 
     # Compute calibrated coefficients
-    cdata = np.log(data / null).reset_index(drop=True) \
-        .replace([np.inf, -np.inf], np.nan) \
-        .dropna() \
-        .mean() \
-        .to_frame().T
+    cdata = calibrate(data, null)
     # Add graph metadata
-    for k, v in reversed(meta.items()):
-        cdata.insert(0, k, v)
-        data.insert(0, k, v)
-        null_avg.insert(0, k, v)
+    data     = add_metadata(data, meta)
+    null_avg = add_metadata(null_avg, meta)
+    cdata    = add_metadata(cdata, meta)
+
+    return data, null_avg, cdata, sig01, sig05, sig10
+
+# Prepare data ----------------------------------------------------------------
+
+HERE = Path(__file__).parent
+DATA = HERE/"data"
+DATA.mkdir(parents=True, exist_ok=True)
+
+# Number of null model samples
+N_SAMPLES = 100
+
+# Base seed for the random number generator
+# used for sampling from the null model;
+# each network gets its own seed derived from it
+SEED = 44
+
+rawdata    = []
+nulltrend  = []
+calibrated = []
+signif_01  = []
+signif_05  = []
+signif_10  = []
 
+# Results are consumed as they arrive instead of being accumulated
+# in one big list by the executor, so the parent process holds only
+# a handful of in-flight results and workers release their
+# intermediates as soon as the six 1-row frames are returned
+results = joblib.Parallel(
+    n_jobs=-1, backend="loky", batch_size="auto", return_as="generator"
+)(
+    joblib.delayed(process_network)(network)
+    for network in tqdm(list_graphs("proteins"))
+)
+
+for data, null_avg, cdata, sig01, sig05, sig10 in results:
     rawdata.append(data)
     nulltrend.append(null_avg)
     calibrated.append(cdata)
@@ -168,4 +233,4 @@ proteins = {
 
 # Save data -------------------------------------------------------------------
 
-joblib.dump(proteins, DATA/"proteins.pkl.gz", compress=True)
+joblib.dump(proteins, DATA/"proteins.pkl.gz", compress=("lz4", 3))
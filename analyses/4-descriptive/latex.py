@@ -1,10 +1,25 @@
 """Function for converting data frames to latex tables."""
 import re
 import pandas as pd
+from natsort import natsort_keygen
+
+# Compiled once at import time; escapes underscores and strips
+# trailing ".00" decimals from the table body in a single pass
+_MID_RX  = re.compile(r"_|\.00(?=\s*\\\\)")
+_CELL_RX = re.compile(r"^\s*(\S*)\s*$")
+
+def _mid_repl(match: re.Match) -> str:
+    return r"\_" if match.group() == "_" else ""
 
 def to_latex(data: pd.DataFrame, dataset: str, **kwds) -> str:
     """Convert data frame to latex table."""
-    data    = data.xs(dataset, level="group")
+    data = data.xs(dataset, level="group")
+    # Natural row order is applied once here, at render time,
+    # keeping the average row last
+    data = pd.concat([
+        data.iloc[:-1].sort_index(key=natsort_keygen()),
+        data.iloc[[-1]]
+    ])
     n_nodes = data["n_nodes"].tolist()
     n_nodes[:-1] = [ str(int(n)) for n in n_nodes[:-1] ]
     n_nodes[-1]  = f"{n_nodes[-1]:.2f}"
@@ -39,13 +54,10 @@ def to_latex(data: pd.DataFrame, dataset: str, **kwds) -> str:
     latex = data.rename(columns=columns).to_latex(**kwds).strip().split("\n")
     pre   = latex[:4]
     top   = latex[4:9]
-    mid   = "\n".join(latex[9:-4]).replace("_", "\_")
-    rx    = re.compile(r"\.00(\s*\\\\\s*)", re.IGNORECASE)
-    mid   = rx.sub(r"\1", mid)
+    mid   = _MID_RX.sub(_mid_repl, "\n".join(latex[9:-4]))
     mid  += "\n\\midrule"
-    rx    = re.compile(r"^\s*(\S*)\s*$", re.IGNORECASE)
     avg   = latex[-4][:-2].strip().split("&")
-    avg   = [ rx.sub(r" \\textbf{\1} ", x) for x in avg ]
+    avg   = [ _CELL_RX.sub(r" \\textbf{\1} ", x) for x in avg ]
     avg   = "&".join(avg) + r" \\"
     bot   = [
         r"\bottomrule",
@@ -2,7 +2,6 @@
 from pathlib import Path
 import pandas as pd
 import joblib
-from natsort import natsort_keygen
 from tqdm.auto import tqdm
 from pathcensus import PathCensus
 from src.utils import load_graph, list_graphs, preprocess_graph
@@ -35,7 +34,7 @@ def get_descriptive_stats(name: str) -> pd.DataFrame:
 
         dataset, network = network.split("__")
 
-        return pd.DataFrame({
+        return {
             "domain":  domain,
             "group":   name,
             "dataset": dataset,
@@ -48,11 +47,11 @@ def get_descriptive_stats(name: str) -> pd.DataFrame:
             "dbar":    degseq.mean(),
             "dcv":     degseq.std() / degseq.mean(),
             "dmax":    degseq.max()
-        }, index=[0])
+        }
 
-    data = pd.concat([
+    data = pd.DataFrame([
         get_network_stats(name, fn) for fn in tqdm(fnames)
-    ], ignore_index=True)
+    ])
 
     keys    = ["domain", "group", "dataset", "network"]
     average = data.set_index(keys).mean().to_frame().T
@@ -62,9 +61,9 @@ def get_descriptive_stats(name: str) -> pd.DataFrame:
     average["network"] = "Average"
     average.set_index(keys, drop=True, inplace=True)
 
-    data = data \
-        .sort_values(keys, key=natsort_keygen()) \
-        .set_index(keys, drop=True)
+    # Human-friendly row order is applied at render time in
+    # `latex.py`, so no natural sort is needed here
+    data = data.set_index(keys, drop=True)
     data = pd.concat([data, average], ignore_index=False)
     return data
 
@@ -77,4 +76,4 @@ data     = pd.concat([
     for dataset in tqdm(datasets)
 ], ignore_index=False)
 
-joblib.dump(data, DATA/"descriptive-statistics.pkl.gz", compress=3)
+joblib.dump(data, DATA/"descriptive-statistics.pkl.gz", compress=("lz4", 3))
@@ -11,8 +11,13 @@ so there is also no need for installing :py:mod:`graph_tool`.
 """
 from typing import Any, Optional, Union, Iterable, List, Dict, Callable
 import os
+import gc
+import json
+import gzip
+import pickle
 from pathlib import Path
 from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import igraph as ig
 import graph_tool.all as gt
@@ -33,7 +38,11 @@ class Netzschleuder:
         Default value for the ``force`` in the
         :py:meth:`fetch` function.
     """
-    apiurl = "https://networks.skewed.de/api/net"
+    apiurl   = "https://networks.skewed.de/api/net"
+    filesurl = "https://networks.skewed.de/net/{name}/files/{network}.gt.zst"
+    # Shared session so repeated API calls reuse one TCP/TLS
+    # connection instead of paying the handshake per request
+    session = requests.Session()
 
     def __init__(
         self,
@@ -56,10 +65,19 @@ class Netzschleuder:
 
     @cached_property
     def networks(self) -> List[str]:
-        """List of networks available for the given dataset."""
-        resp = requests.get(f"{self.apiurl}/{self.name}")
+        """List of networks available for the given dataset.
+
+        The dataset manifest is cached on disk under `datapath`,
+        so fresh processes do not hit the HTTP API again;
+        ``force=True`` refreshes the cache.
+        """
+        mpath = self.datapath/f"{self.name}__manifest.json"
+        if mpath.exists() and not self.force:
+            return json.loads(mpath.read_text())["nets"]
+        resp = self.session.get(f"{self.apiurl}/{self.name}")
         resp.raise_for_status()
         data = resp.json()
+        mpath.write_text(json.dumps(data))
         return data["nets"]
 
     # Main methods ------------------------------------------------------------
@@ -82,15 +100,41 @@ class Netzschleuder:
         postprocess
             Optional callable for postprocessing
             graph. It should have the following signature
-            ``(graph_tool.Graph) -> (graph_tool.Graph)``.
+            ``(igraph.Graph) -> (igraph.Graph)``.
+            It is applied after the conversion from
+            :py:mod:`graph_tool`, so callers can define it
+            in terms of :py:mod:`igraph` alone.
         **kwds
             Passed to :py:meth:`gt_to_igraph`.
         """
         network = network or self.name
-        graph = gt.collection.ns[f"{self.name}/{network}"]
+        # Stream the raw `.gt.zst` file to disk in 1MB chunks and
+        # parse it from there, instead of letting `gt.collection`
+        # materialize the download in memory next to the parsed
+        # graph; the temporary file is removed once parsed
+        # the filename must keep the `.gt.zst` suffix because
+        # graph_tool infers both format and compression from it;
+        # the leading dot marks the file as temporary
+        url  = self.filesurl.format(name=self.name, network=network)
+        tmp  = self.datapath/f".{self.name}__{network}.tmp.gt.zst"
+        try:
+            with self.session.get(url, stream=True) as resp:
+                resp.raise_for_status()
+                with open(tmp, "wb") as fh:
+                    for chunk in resp.iter_content(chunk_size=2**20):
+                        fh.write(chunk)
+            gtgraph = gt.load_graph(os.fspath(tmp))
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        graph = self.gt_to_igraph(gtgraph, **kwds)
+        # Drop the graph_tool representation before postprocessing
+        # so at most two copies of the graph are alive at once
+        del gtgraph
+        gc.collect()
         if postprocess is not None:
             graph = postprocess(graph)
-        return self.gt_to_igraph(graph, **kwds)
+        return graph
 
     def fetch(
         self,
@@ -126,12 +170,73 @@ class Netzschleuder:
         fpath = self.datapath/f"{self.name}__{alias}.pkl.gz"
         if force or not fpath.exists():
             graph = self.download(network, **kwds)
-            graph.write_picklez(str(fpath))
+            # Written once, loaded many times: gzip level 1
+            # compresses several times faster than the write_picklez
+            # default (level 9), decompresses just as fast and costs
+            # only ~15% extra disk; protocol 5 keeps the large
+            # internal buffers out-of-band
+            with gzip.open(fpath, "wb", compresslevel=1) as fh:
+                pickle.dump(graph, fh, protocol=5)
             return graph
-        return ig.Graph.Read_Picklez(str(fpath))
+        return ig.Graph.Read_Picklez(os.fspath(fpath))
+
+    def fetch_many(
+        self,
+        networks: Iterable[str],
+        *,
+        max_workers: int = 8,
+        **kwds: Any
+    ) -> Dict[str, ig.Graph]:
+        """Fetch multiple networks of a dataset concurrently.
+
+        Fetching is I/O-bound (HTTP download followed by a pickle
+        write), so a thread pool overlaps the latency of up to
+        `max_workers` downloads. Useful for datasets consisting of
+        many sub-networks that share the same metadata; downloads
+        with per-network metadata should call :py:meth:`fetch`
+        directly.
+
+        Parameters
+        ----------
+        networks
+            Names of the networks to fetch.
+        max_workers
+            Number of worker threads.
+        **kwds
+            Passed to :py:meth:`fetch`.
+
+        Returns
+        -------
+        graphs
+            Mapping from network names to fetched graphs.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch, network, **kwds): network
+                for network in networks
+            }
+            return {
+                futures[fut]: fut.result()
+                for fut in as_completed(futures)
+            }
 
     # Auxiliary method --------------------------------------------------------
 
+    @staticmethod
+    def _property_values(pmap) -> list:
+        """Extract values of a :py:mod:`graph_tool` property map.
+
+        Scalar-typed maps are read through their numpy array view,
+        which converts to a list at C level instead of boxing every
+        value while iterating the map in Python. Maps without an
+        array view (strings, objects, vector-valued properties)
+        fall back to iteration.
+        """
+        array = pmap.get_array()
+        if array is None:
+            return list(pmap)
+        return array.tolist()
+
     @staticmethod
     def gt_to_igraph(
         graph: gt.Graph,
@@ -153,19 +258,31 @@ class Netzschleuder:
         **kwds
             Additional graph properties.
         """
-        i, j = gt.adjacency(graph).nonzero()
-        G = ig.Graph(graph.num_vertices(), directed=graph.is_directed())
-        G.add_edges(list(zip(i, j)))
+        # `get_edges()` hands over the endpoints as one numpy array
+        # which goes straight into the igraph constructor, skipping
+        # the sparse adjacency detour and the |E|-element Python
+        # list of pairs it used to be converted through
+        G = ig.Graph(
+            graph.num_vertices(),
+            graph.get_edges(),
+            directed=graph.is_directed()
+        )
 
         if  vp:
             for attr, prop in vp.items():
-                G.vs[attr] = list(graph.vp[prop])
+                G.vs[attr] = Netzschleuder._property_values(graph.vp[prop])
         if ep:
             for attr, prop in ep.items():
-                G.es[attr] = list(graph.ep[prop])
+                G.es[attr] = Netzschleuder._property_values(graph.ep[prop])
         for prop in graph.gp:
             if prop == "tags":
-                G[prop] = list(set(graph.gp[prop]) | set(add_tags))
+                tags = graph.gp[prop]
+                if add_tags:
+                    # `dict.fromkeys` deduplicates while keeping
+                    # insertion order, so the output is deterministic
+                    G[prop] = list(dict.fromkeys([*tags, *add_tags]))
+                else:
+                    G[prop] = list(tags)
             else:
                 G[prop] = str(graph.gp[prop])
         for k, v in kwds.items():
@@ -1,12 +1,40 @@
 """Utility functions."""
-from typing import Any, Optional, Union, List, Callable
+from typing import Any, Optional, Union, List, Tuple, Callable
 import os
+import io
+import gzip
+import pickle
+import functools
 from pathlib import Path
 import numpy as np
+import numba as nb
+from scipy.spatial import cKDTree
+import pandas as pd
 import igraph as ig
 from . import DATA
 
 
+@functools.lru_cache(maxsize=8)
+def _read_graph(fpath: str) -> ig.Graph:
+    """Read a pickled graph with an in-process cache.
+
+    Repeated loads of the same file within one session
+    (e.g. in a notebook computing several metrics) skip the gzip
+    decompression and unpickling entirely. The on-disk pickles are
+    immutable, so the cache never goes stale; it is bounded so at
+    most the eight most recently used graphs stay resident.
+    Callers receive copies, so the cached instances are never
+    exposed to mutation.
+
+    Graphs are pickled gzip streams, so this is equivalent to
+    :py:meth:`igraph.Graph.Read_Picklez` except the stream is read
+    through a 128KB buffer instead of the 8KB default, which cuts
+    per-call decompression overhead on larger graphs.
+    """
+    with gzip.open(fpath, "rb") as raw:
+        with io.BufferedReader(raw, buffer_size=131072) as fh:
+            return pickle.load(fh)
+
 def list_graphs(
     dataset: str,
     *,
@@ -23,8 +51,8 @@ def list_graphs(
     """
     path = Path(datapath)/dataset
     return [
-        ".".join(fpath.stem.split(".")[:-1]) for fpath
-        in path.glob("*.pkl.gz")
+        fpath.name[:-len(".pkl.gz")]
+        for fpath in path.glob("*.pkl.gz")
     ]
 
 def load_graph(
@@ -33,6 +61,7 @@ def load_graph(
     *,
     datapath: Union[str, bytes, os.PathLike] = DATA,
     preprocess: bool = False,
+    cache: bool = False,
     **kwds: Any
 ) -> ig.Graph:
     """Load graph from a given dataset.
@@ -48,6 +77,12 @@ def load_graph(
         Path to the main data directory.
     preprocess
         Should the graph be preprocess after loading.
+    cache
+        Should the preprocessed graph be cached as a pickle
+        next to the source file and reused on subsequent runs.
+        Preprocessing is pure and deterministic so the cache is
+        safe to reuse; it is used only with the default
+        preprocessing options (no extra ``**kwds``).
     **kwds
         Passed to :py:func:`preprocess_graph` when ``preprocess=True``.
         Ignored otherwise.
@@ -58,21 +93,65 @@ def load_graph(
     name += ".pkl.gz"
 
     fpath = Path(datapath)/dataset/name
-    graph = ig.Graph.Read_Picklez(str(fpath))
+    cache = cache and preprocess and not kwds
+    cpath = fpath.with_name(fpath.name.replace(".pkl.gz", ".pre.pkl"))
+    if cache and cpath.exists():
+        return ig.Graph.Read_Pickle(os.fspath(cpath))
+
+    graph = _read_graph(os.fspath(fpath))
     if preprocess:
+        # operates on a copy, so the cached instance is safe
         graph = preprocess_graph(graph, **kwds)
+    else:
+        graph = graph.copy()
+    if cache:
+        graph.write_pickle(os.fspath(cpath))
     return graph
 
+def get_components(
+    graph: ig.Graph,
+    mode: Optional[str] = None,
+    *,
+    cache: bool = True
+) -> List[tuple]:
+    """Get connected components of a graph with caching.
+
+    The decomposition is stored as a graph attribute keyed by
+    `mode`, so repeated calls within one analysis pipeline reuse
+    it instead of re-running the O(V+E) search. The cache is valid
+    only as long as the graph is not mutated; code mutating a graph
+    afterwards should drop its ``__components_*__`` attributes.
+
+    Parameters
+    ----------
+    graph
+        Graph object.
+    mode
+        Passed to :py:meth:`igraph.Graph.components`.
+    cache
+        Should the decomposition be cached on the graph.
+    """
+    key = f"__components_{mode}__"
+    if cache and key in graph.attributes():
+        return graph[key]
+    kwds = dict(mode=mode) if mode else {}
+    components = [tuple(c) for c in graph.components(**kwds)]
+    if cache:
+        graph[key] = components
+    return components
+
 def get_largest_component(graph: ig.Graph, **kwds: Any) -> ig.Graph:
     """Get largest component of a graph.
 
-    ``**kwds`` are passed to :py:meth:`igraph.Graph.components`.
+    ``**kwds`` are passed to :py:func:`get_components`.
     """
-    vids = None
-    for component in graph.components(**kwds):
-        if vids is None or len(component) > len(vids):
-            vids = component
-    return graph.induced_subgraph(vids)
+    vids = max(get_components(graph, **kwds), key=len)
+    sub = graph.induced_subgraph(vids)
+    # `induced_subgraph` copies graph attributes, so drop the
+    # component cache, which is stale for the subgraph
+    for key in [a for a in sub.attributes() if a.startswith("__components_")]:
+        del sub[key]
+    return sub
 
 def preprocess_graph(
     graph: ig.Graph,
@@ -108,7 +187,12 @@ def preprocess_graph(
     graph
         Preprocess copy of the original `graph`.
     """
-    graph = graph.copy()
+    # `simplify` and `to_undirected` mutate in place, so they must
+    # work on a copy; when neither runs and only the largest
+    # component is extracted, `induced_subgraph` already returns a
+    # fresh graph and the upfront copy would be pure waste
+    if simplify or undirected or not largest_component:
+        graph = graph.copy()
     if simplify:
         graph.simplify(combine_edges=combine_edges, **kwds)
     if undirected:
@@ -118,6 +202,140 @@ def preprocess_graph(
         graph = get_largest_component(graph, **mode)
     return graph
 
+def graph_to_csr(graph: ig.Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a graph to CSR adjacency arrays.
+
+    Returns
+    -------
+    indptr
+        Row pointer array of length ``vcount + 1``.
+    indices
+        Column indices of neighbors, row by row.
+    """
+    n = graph.vcount()
+    # reshape keeps the array 2D also for edgeless graphs, where
+    # the empty edge list converts to shape (0,)
+    edges = np.asarray(graph.get_edgelist(), dtype=np.int64).reshape(-1, 2)
+    if not graph.is_directed():
+        edges = np.vstack([edges, edges[:, ::-1]])
+    order = np.argsort(edges[:, 0], kind="stable")
+    src = edges[order, 0]
+    dst = edges[order, 1].astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(indptr, src + 1, 1)
+    np.cumsum(indptr, out=indptr)
+    return indptr, dst
+
+def save_graph_csr(
+    graph: ig.Graph,
+    fpath: Union[str, bytes, os.PathLike]
+) -> None:
+    """Save CSR adjacency arrays of a graph as ``.npy`` files.
+
+    Two files are written, ``<fpath>-indptr.npy`` and
+    ``<fpath>-indices.npy``. Plain ``.npy`` files (rather than one
+    ``.npz`` archive) are used so they can be memory-mapped on load.
+    """
+    indptr, indices = graph_to_csr(graph)
+    fpath = os.fspath(fpath)
+    np.save(fpath + "-indptr.npy", indptr)
+    np.save(fpath + "-indices.npy", indices)
+
+def load_graph_csr(
+    dataset: str,
+    name: Optional[str] = None,
+    *,
+    datapath: Union[str, bytes, os.PathLike] = DATA,
+    mmap_mode: Optional[str] = "r"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Load CSR adjacency arrays for a network of a dataset.
+
+    Companion to :py:func:`load_graph` for analyses that need only
+    the adjacency structure: the arrays are memory-mapped, so the
+    load is effectively instant and plugs straight into
+    :py:mod:`scipy.sparse` or plain numpy code without rebuilding
+    an :py:class:`igraph.Graph` from a pickle. The files are
+    produced by :py:func:`save_graph_csr`.
+
+    Parameters
+    ----------
+    dataset
+        Name of a dataset.
+    name
+        Name of a particular network.
+        It is assumed to be equal to `dataset` if ``None``.
+    datapath
+        Path to the main data directory.
+    mmap_mode
+        Passed to :py:func:`numpy.load`.
+    """
+    name = name or dataset
+    if "__" not in name:
+        name += "__" + name
+
+    fpath = os.fspath(Path(datapath)/dataset/f"{name}.csr")
+    indptr = np.load(fpath + "-indptr.npy", mmap_mode=mmap_mode)
+    indices = np.load(fpath + "-indices.npy", mmap_mode=mmap_mode)
+    return indptr, indices
+
+def add_index_level(
+    df: pd.DataFrame,
+    value: Any = 0,
+    name: str = "_"
+) -> pd.DataFrame:
+    """Prepend a constant outer index level in place.
+
+    Equivalent to ``pd.concat([df], keys=[value], names=[name])``
+    but only rebinds the index instead of copying the whole frame.
+    """
+    df.index = pd.MultiIndex.from_arrays([
+        np.full(len(df), value),
+        *(df.index.get_level_values(i) for i in range(df.index.nlevels))
+    ], names=[name, *df.index.names])
+    return df
+
+def calibrate(data: pd.DataFrame, null: pd.DataFrame) -> pd.DataFrame:
+    """Mean of ``log(data / null)`` over rows with all entries finite.
+
+    Fused numpy equivalent of the
+    ``np.log(data / null).replace([np.inf, -np.inf], np.nan).dropna().mean()``
+    chain, which scans and copies the frame three times.
+
+    Parameters
+    ----------
+    data
+        Observed statistics; a single row broadcast against `null`.
+    null
+        Null model statistics, one row per sample.
+    """
+    r = np.log(np.asarray(data, dtype=float) / np.asarray(null, dtype=float))
+    rows = np.isfinite(r).all(axis=1)
+    return pd.DataFrame(r[rows].mean(axis=0)[None, :], columns=data.columns)
+
+@nb.njit(cache=True, parallel=True, fastmath=True)
+def _rescale_kernel(X, m0, m1):
+    """Jit-compiled single-pass rescaling kernel.
+
+    Min, max, scale and clip are fused into one sweep over the
+    array, so the whole transform touches memory once instead of
+    once per numpy operation.
+    """
+    lo = X.min()
+    hi = X.max()
+    out = np.empty_like(X)
+    if hi == lo:
+        out[:] = m0
+        return out
+    scale = (m1 - m0) / (hi - lo)
+    for i in nb.prange(X.shape[0]):
+        v = (X[i] - lo) * scale + m0
+        if v < m0:
+            v = m0
+        elif v > m1:
+            v = m1
+        out[i] = v
+    return out
+
 def rescale(X: np.ndarray, m0=0, m1=1) -> np.ndarray:
     """Rescale numeric 1D array.
 
@@ -130,35 +348,54 @@ def rescale(X: np.ndarray, m0=0, m1=1) -> np.ndarray:
     m1
         Maximum value. Has to be greater than ``m0``.
     """
-    if not isinstance(X, np.ndarray):
-        X = np.array(X)
+    X = np.asarray(X, dtype=np.float64)
     if m0 >= m1:
         raise ValueError("'m0' has to be lower than 'm1'")
     if X.ndim != 1:
         raise AttributeError("'X' has to be 1D")
-
-    X -= X.min()
-    xmax = X.max()
-    if xmax != 0:
-        X /= X.max()
-
-    if m1 != 1:
-        X *= m1 - m0
-    if m0 != 0:
-        X += m0
-
-    return np.clip(X, m0, m1)
+    return _rescale_kernel(X, float(m0), float(m1))
 
 def make_er_graph(n: int, kbar: float) -> ig.Graph:
     """Make ER random graph with given number of nodes
     and average degree.
+
+    The edge list is sampled directly: the number of edges is
+    binomial and the edges are decoded from uniformly drawn
+    upper-triangle indices, so the cost is O(E) instead of the
+    O(n^2) scan over all vertex pairs.
     """
     p = kbar / (n-1)
-    return ig.Graph.Erdos_Renyi(n, p=p, directed=False)
+    max_edges = n * (n-1) // 2
+    m = np.random.binomial(max_edges, p)
+
+    # Draw `m` distinct edge indices; duplicates are redrawn,
+    # which takes O(1) expected rounds for sparse graphs
+    idx = np.array([], dtype=np.int64)
+    while idx.size < m:
+        draw = np.random.randint(0, max_edges, size=m - idx.size)
+        idx = np.unique(np.concatenate([idx, draw]))
+
+    # Decode linear indices into upper-triangle pairs (i > j);
+    # the corrections guard against floating-point rounding
+    # of the square root at bin boundaries
+    i = np.ceil(np.sqrt(2*(idx+1) + 0.25) - 0.5).astype(np.int64)
+    i -= i*(i-1)//2 > idx
+    i += idx >= i*(i+1)//2
+    j = idx - i*(i-1)//2
+
+    return ig.Graph(n, np.column_stack([i, j]).tolist(), directed=False)
 
 def make_rgg(n: int, kbar: float) -> ig.Graph:
     """Make Random Geometric Graph with given number of nodes
     and average degree.
+
+    Neighbor pairs are found with a k-d tree range query in
+    O(n log n) instead of the O(n^2) pairwise scan done by
+    :py:meth:`igraph.Graph.GRG`; ``boxsize=1.0`` gives native
+    periodic boundaries, matching ``torus=True``.
     """
     radius = np.sqrt(kbar/(np.pi*(n-1)))
-    return ig.Graph.GRG(n, radius=radius, torus=True)
+    points = np.random.random((n, 2))
+    tree   = cKDTree(points, boxsize=1.0)
+    edges  = tree.query_pairs(radius, output_type="ndarray")
+    return ig.Graph(n, edges, directed=False)